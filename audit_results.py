@@ -0,0 +1,250 @@
+"""
+Audit Results API
+Shared finding model and streaming reporters for the audit scripts.
+
+Each audit check is a generator that yields Finding objects as it produces
+them. run_checks() forwards every finding to a reporter immediately, so
+text, JSON Lines and JUnit XML output can be consumed while the audit is
+still running, and returns a severity-based exit code.
+
+Exit codes: 0 when no finding reaches the --fail-on threshold, 1 for
+warnings (with --fail-on warning), 3 for errors. 2 is left to argparse,
+which uses it for usage errors, so CI can tell a broken invocation from a
+failed audit.
+"""
+
+import json
+import sys
+from dataclasses import asdict, dataclass, replace
+from typing import Optional
+from xml.sax.saxutils import escape, quoteattr
+
+INFO = 'info'
+WARNING = 'warning'
+ERROR = 'error'
+
+SEVERITY_RANK = {INFO: 0, WARNING: 1, ERROR: 2}
+
+# Exit code per worst severity, once it reaches the --fail-on threshold;
+# 2 is argparse's usage-error code
+EXIT_CODES = {INFO: 0, WARNING: 1, ERROR: 3}
+
+FORMATS = ['text', 'jsonl', 'junit']
+
+
+@dataclass(frozen=True)
+class Finding:
+    """A single result produced by an audit check"""
+    check: str
+    severity: str
+    message: str
+    subject: Optional[str] = None
+    path: Optional[str] = None
+    root: Optional[str] = None
+    # Structured payload for reporters, e.g. the service IDs a count refers to
+    details: Optional[tuple] = None
+
+
+class TextReporter:
+    """Human-readable output in the audits' original layout"""
+
+    MARKERS = {INFO: '-', WARNING: '!', ERROR: 'X'}
+
+    def __init__(self, stream, width=80):
+        self.stream = stream
+        self.width = width
+        self.step = 0
+        self.findings = 0
+
+    def begin(self, title):
+        self._write("=" * self.width)
+        self._write(title)
+        self._write("=" * self.width)
+        self._write()
+
+    def start_check(self, check, description):
+        self.step += 1
+        self.findings = 0
+        self._write(f"Step {self.step}: {description}...")
+
+    def finding(self, finding):
+        self.findings += 1
+        self._write(f"  {self.MARKERS[finding.severity]} {finding.message}")
+
+    def end_check(self, check):
+        # Only a check that reported nothing at all gets the pass marker;
+        # INFO-only checks (counts, listings) have nothing to pass or fail.
+        if not self.findings:
+            self._write("  ✓ No issues found")
+        self._write()
+
+    def end(self, counts):
+        self._write("=" * self.width)
+        self._write(f"AUDIT COMPLETE: {counts[ERROR]} errors, {counts[WARNING]} warnings")
+        self._write("=" * self.width)
+
+    def _write(self, text=""):
+        self.stream.write(text + "\n")
+        self.stream.flush()
+
+
+class JsonLinesReporter:
+    """One JSON object per line: a record per finding, then a summary record"""
+
+    def __init__(self, stream, width=None):
+        self.stream = stream
+
+    def begin(self, title):
+        pass
+
+    def start_check(self, check, description):
+        pass
+
+    def finding(self, finding):
+        record = {'type': 'finding'}
+        record.update({key: value for key, value in asdict(finding).items() if value is not None})
+        self._write(record)
+
+    def end_check(self, check):
+        pass
+
+    def end(self, counts):
+        self._write({'type': 'summary', **counts})
+
+    def _write(self, record):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+
+class JUnitReporter:
+    """JUnit XML: a testsuite per check and a testcase per finding.
+
+    Errors become <failure> elements; warnings and info findings are passing
+    testcases whose message is kept in <system-out>. A check without any
+    findings is reported as a single passing testcase. Each suite is buffered
+    until its check finishes so that it can carry tests/failures counts;
+    suites are still written one by one as checks complete.
+    """
+
+    def __init__(self, stream, width=None):
+        self.stream = stream
+        self.testcases = []
+        self.names = set()
+        self.failures = 0
+
+    def begin(self, title):
+        self._write('<?xml version="1.0" encoding="UTF-8"?>')
+        self._write(f"<testsuites name={quoteattr(title)}>")
+
+    def start_check(self, check, description):
+        self.testcases = []
+        self.names = set()
+        self.failures = 0
+
+    def finding(self, finding):
+        name = finding.message
+        if finding.root:
+            name = f"{finding.root}: {name}"
+        # Testcase names must be unique within a suite for most CI parsers
+        unique_name, n = name, 1
+        while unique_name in self.names:
+            n += 1
+            unique_name = f"{name} ({n})"
+        self.names.add(unique_name)
+
+        lines = [f"    <testcase classname={quoteattr('audit.' + finding.check)} name={quoteattr(unique_name)}>"]
+        if finding.severity == ERROR:
+            self.failures += 1
+            lines.append(
+                f"      <failure type={quoteattr(finding.severity)} message={quoteattr(finding.message)}/>"
+            )
+        else:
+            lines.append(
+                f"      <system-out>{escape(finding.severity.upper() + ': ' + finding.message)}</system-out>"
+            )
+        lines.append("    </testcase>")
+        self.testcases.append("\n".join(lines))
+
+    def end_check(self, check):
+        if not self.testcases:
+            self.testcases.append(f"    <testcase classname={quoteattr('audit.' + check)} name=\"passed\"/>")
+        self._write(
+            f"  <testsuite name={quoteattr(check)} tests=\"{len(self.testcases)}\" failures=\"{self.failures}\">"
+        )
+        for testcase in self.testcases:
+            self._write(testcase)
+        self._write("  </testsuite>")
+
+    def end(self, counts):
+        self._write("</testsuites>")
+
+    def _write(self, text):
+        self.stream.write(text + "\n")
+        self.stream.flush()
+
+
+REPORTERS = {
+    'text': TextReporter,
+    'jsonl': JsonLinesReporter,
+    'junit': JUnitReporter,
+}
+
+
+def add_output_arguments(parser):
+    """Register the --format / --output / --fail-on options shared by all audits"""
+    parser.add_argument('--format', choices=FORMATS, default='text',
+                        help="output format (default: %(default)s)")
+    parser.add_argument('--output', metavar='FILE', default=None,
+                        help="write results to this file instead of stdout")
+    parser.add_argument('--fail-on', choices=[WARNING, ERROR], default=ERROR,
+                        help="lowest severity that produces a non-zero exit code (default: %(default)s)")
+
+
+def exit_code(counts, fail_on):
+    """Severity-based exit code: 3 for errors, 1 for warnings, 0 otherwise"""
+    for severity in (ERROR, WARNING):
+        if counts[severity] and SEVERITY_RANK[severity] >= SEVERITY_RANK[fail_on]:
+            return EXIT_CODES[severity]
+    return 0
+
+
+def for_root(root, check):
+    """Tag every finding of check() with the checkout it was produced for"""
+    for finding in check():
+        yield replace(finding, root=root)
+
+
+def run_checks(title, checks, reporter):
+    """Stream every finding of every check to reporter; return severity counts.
+
+    `checks` is an iterable of (name, description, generator function) tuples;
+    it may itself be a generator, so that later checks are only built once
+    earlier ones have been reported.
+    """
+    counts = {INFO: 0, WARNING: 0, ERROR: 0}
+    reporter.begin(title)
+    for name, description, check in checks:
+        reporter.start_check(name, description)
+        for finding in check():
+            counts[finding.severity] += 1
+            reporter.finding(finding)
+        reporter.end_check(name)
+    reporter.end(counts)
+    return counts
+
+
+def report(title, checks, args, width=80, reporters=None):
+    """Run checks with the reporter selected by parsed CLI args; return the exit code
+
+    `width` is the banner width of text output; `reporters` overrides entries
+    of REPORTERS for one audit's own layout. The --output file is only opened
+    here, after the audit has validated its arguments.
+    """
+    reporter_class = {**REPORTERS, **(reporters or {})}[args.format]
+    stream = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        counts = run_checks(title, checks, reporter_class(stream, width))
+    finally:
+        if args.output:
+            stream.close()
+    return exit_code(counts, args.fail_on)
@@ -6,18 +6,42 @@ Performs 5-way cross-validation across:
 3. Component files
 4. TypeScript interfaces
 5. servicesDatabase.ts
+
+Also cross-indexes FIELD_REGISTRY against the wizard steps and the
+fieldId references in Phase 2 components.
+
+Several checkouts (e.g. client forks) can be audited in one run. Files are
+read and extracted on a shared process pool, and files that are
+byte-identical across checkouts are extracted at most once per worker.
+
+Usage:
+    python audit_script.py                              # BASE_DIR
+    python audit_script.py fork-a fork-b fork-c
+    python audit_script.py --roots-file forks.txt --jobs 8
 """
 
+import argparse
+import hashlib
 import re
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
 from pathlib import Path
 from collections import defaultdict
 
+from audit_results import ERROR, INFO, WARNING, Finding, add_output_arguments, for_root, report
+
 # Base paths
 BASE_DIR = Path(r"C:\Users\eyaly\Desktop\Businesses\eym-group_n8n\internal_app\discovery-assistant")
-CONFIG_DIR = BASE_DIR / "src" / "config"
-COMPONENTS_DIR = BASE_DIR / "src" / "components" / "Phase2" / "ServiceRequirements"
-TYPES_DIR = BASE_DIR / "src" / "types"
+
+# Paths inside a discovery-assistant checkout
+MAPPING_FILE = Path("src") / "config" / "serviceComponentMapping.ts"
+REGISTRY_FILE = Path("src") / "config" / "fieldRegistry.ts"
+WIZARD_FILE = Path("src") / "config" / "wizardSteps.ts"
+COMPONENTS_SUBDIR = Path("src") / "components" / "Phase2" / "ServiceRequirements"
+TYPES_SUBDIR = Path("src") / "types"
+PHASE2_SUBDIR = Path("src") / "components" / "Phase2"
 
 # Expected services per category
 EXPECTED_SERVICES = {
@@ -28,11 +52,30 @@ EXPECTED_SERVICES = {
     'additionalServices': 10,  # Services 50-59
 }
 
-def extract_service_component_map():
-    """Extract all entries from SERVICE_COMPONENT_MAP"""
-    mapping_file = CONFIG_DIR / "serviceComponentMapping.ts"
-    content = mapping_file.read_text(encoding='utf-8')
+CATEGORY_DIR_MAP = {
+    'automations': 'Automations',
+    'aiAgentServices': 'AIAgents',
+    'integrationServices': 'Integrations',
+    'systemImplementations': 'SystemImplementations',
+    'additionalServices': 'AdditionalServices'
+}
+
+# Files per extraction task on the process pool
+EXTRACT_BATCH_SIZE = 64
+
+# Kinds of file every checkout must have; the others are optional
+REQUIRED_KINDS = {'mapping', 'registry', 'wizard'}
+
+TYPE_FILES = {
+    'automationServices.ts': 'automations',
+    'aiAgentServices.ts': 'aiAgentServices',
+    'integrationServices.ts': 'integrationServices',
+    'systemImplementationServices.ts': 'systemImplementations',
+    'additionalServices.ts': 'additionalServices'
+}
 
+def extract_service_component_map(content):
+    """Extract all entries from SERVICE_COMPONENT_MAP"""
     # Extract the SERVICE_COMPONENT_MAP object
     match = re.search(r'export const SERVICE_COMPONENT_MAP.*?=\s*{(.*?)^};', content, re.DOTALL | re.MULTILINE)
     if not match:
@@ -51,11 +94,8 @@ def extract_service_component_map():
 
     return services
 
-def extract_service_category_map():
+def extract_service_category_map(content):
     """Extract all entries from SERVICE_CATEGORY_MAP"""
-    mapping_file = CONFIG_DIR / "serviceComponentMapping.ts"
-    content = mapping_file.read_text(encoding='utf-8')
-
     # Extract the SERVICE_CATEGORY_MAP object
     match = re.search(r'export const SERVICE_CATEGORY_MAP.*?=\s*{(.*?)^};', content, re.DOTALL | re.MULTILINE)
     if not match:
@@ -73,52 +113,8 @@ def extract_service_category_map():
 
     return services
 
-def get_component_files():
-    """Get all component .tsx files and their locations"""
-    components = {}
-
-    for category_dir in COMPONENTS_DIR.iterdir():
-        if category_dir.is_dir():
-            category_name = category_dir.name
-            for file_path in category_dir.glob("*.tsx"):
-                component_name = file_path.stem
-                components[component_name] = {
-                    'path': str(file_path.relative_to(BASE_DIR)),
-                    'category_dir': category_name,
-                    'exists': True
-                }
-
-    return components
-
-def get_typescript_interfaces():
-    """Extract all *Requirements interfaces from type files"""
-    interfaces = defaultdict(list)
-
-    type_files = {
-        'automationServices.ts': 'automations',
-        'aiAgentServices.ts': 'aiAgentServices',
-        'integrationServices.ts': 'integrationServices',
-        'systemImplementationServices.ts': 'systemImplementations',
-        'additionalServices.ts': 'additionalServices'
-    }
-
-    for type_file, category in type_files.items():
-        file_path = TYPES_DIR / type_file
-        if file_path.exists():
-            content = file_path.read_text(encoding='utf-8')
-            # Find all interface definitions
-            pattern = r'export interface (\w+(?:Requirements|Config))\s*{'
-            for match in re.finditer(pattern, content):
-                interface_name = match.group(1)
-                interfaces[category].append(interface_name)
-
-    return interfaces
-
-def extract_import_statements():
+def extract_import_statements(content):
     """Extract all import statements from serviceComponentMapping.ts"""
-    mapping_file = CONFIG_DIR / "serviceComponentMapping.ts"
-    content = mapping_file.read_text(encoding='utf-8')
-
     # Find all import statements
     pattern = r"import\s*{\s*(\w+)\s*}\s*from\s*['\"]([^'\"]+)['\"]"
     imports = {}
@@ -129,126 +125,519 @@ def extract_import_statements():
 
     return imports
 
-def main():
-    print("="*80)
-    print("PHASE 2 SERVICE REQUIREMENTS SYSTEM AUDIT")
-    print("="*80)
-    print()
-
-    # Step 1: Extract data from all sources
-    print("Step 1: Extracting data from all sources...")
-    component_map = extract_service_component_map()
-    category_map = extract_service_category_map()
-    component_files = get_component_files()
-    interfaces = get_typescript_interfaces()
-    imports = extract_import_statements()
-
-    print(f"  - SERVICE_COMPONENT_MAP: {len(component_map)} entries")
-    print(f"  - SERVICE_CATEGORY_MAP: {len(category_map)} entries")
-    print(f"  - Component files found: {len(component_files)} files")
-    print(f"  - TypeScript interfaces found: {sum(len(v) for v in interfaces.values())} interfaces")
-    print(f"  - Import statements: {len(imports)} imports")
-    print()
-
-    # Step 2: Validate basic integrity
-    print("Step 2: Basic Integrity Checks...")
-    issues = []
+def extract_service_mapping(content):
+    """Extract both service maps and the imports from serviceComponentMapping.ts"""
+    return {
+        'component_map': extract_service_component_map(content),
+        'category_map': extract_service_category_map(content),
+        'imports': extract_import_statements(content),
+    }
+
+def extract_interfaces(content):
+    """Extract all *Requirements / *Config interface names from a type file"""
+    # Find all interface definitions
+    pattern = r'export interface (\w+(?:Requirements|Config))\s*{'
+    return [match.group(1) for match in re.finditer(pattern, content)]
+
+# Single-line patterns used by the streaming field index
+REGISTRY_KEY_PATTERN = re.compile(r"^  (\w+): \{\s*$")
+REGISTRY_ID_PATTERN = re.compile(r"^\s+id: '([\w-]+)',")
+REGISTRY_PATH_PATTERN = re.compile(r"^\s+path: '(modules\.[^']+)',")
+REGISTRY_USED_BY_PATTERN = re.compile(r"^\s+usedBy: \[(.*)$")
+QUOTED_ID_PATTERN = re.compile(r"'([\w*-]+)'")
+WIZARD_MODULE_PATTERN = re.compile(r"^\s+moduleId: '(\w+)',")
+WIZARD_FIELD_PATTERN = re.compile(r"^\s+name: '([\w.]+)',")
+FIELD_ID_PATTERN = re.compile(r"fieldId: '([\w-]+)'")
+ARRAY_INDEX_PATTERN = re.compile(r"\[\d*\]")
+
+def index_field_registry(lines):
+    """Index FIELD_REGISTRY in one pass.
+
+    Returns (field ID -> lines, id/key mismatches, module source path -> field
+    IDs, field ID -> usedBy service IDs).
+    """
+    fields = defaultdict(list)
+    id_mismatches = []
+    source_paths = defaultdict(set)
+    used_by = defaultdict(list)
+
+    in_registry = False
+    in_used_by = False
+    current_key = None
+    for line_no, line in enumerate(lines, 1):
+        if not in_registry:
+            in_registry = line.startswith('export const FIELD_REGISTRY')
+            continue
+        if line.startswith('};'):
+            break
+
+        # usedBy lists may span several lines, up to the closing bracket
+        if in_used_by:
+            used_by[current_key].extend(QUOTED_ID_PATTERN.findall(line.split(']', 1)[0]))
+            in_used_by = ']' not in line
+            continue
+
+        match = REGISTRY_KEY_PATTERN.match(line)
+        if match:
+            current_key = match.group(1)
+            fields[current_key].append(line_no)
+            continue
+
+        match = REGISTRY_ID_PATTERN.match(line)
+        if match and current_key and match.group(1) != current_key:
+            id_mismatches.append((current_key, match.group(1), line_no))
+            continue
+
+        match = REGISTRY_USED_BY_PATTERN.match(line)
+        if match and current_key:
+            rest = match.group(1)
+            used_by[current_key].extend(QUOTED_ID_PATTERN.findall(rest.split(']', 1)[0]))
+            in_used_by = ']' not in rest
+            continue
+
+        match = REGISTRY_PATH_PATTERN.match(line)
+        if match and current_key:
+            source_paths[ARRAY_INDEX_PATTERN.sub('', match.group(1))].add(current_key)
+
+    return fields, id_mismatches, source_paths, used_by
+
+def index_wizard_fields(lines):
+    """Index WIZARD_STEPS in one pass: 'modules.<moduleId>.<name>' -> lines"""
+    fields = defaultdict(list)
+
+    module_id = None
+    for line_no, line in enumerate(lines, 1):
+        match = WIZARD_MODULE_PATTERN.match(line)
+        if match:
+            module_id = match.group(1)
+            continue
+
+        match = WIZARD_FIELD_PATTERN.match(line)
+        if match and module_id:
+            fields[f"modules.{module_id}.{match.group(1)}"].append(line_no)
+
+    return fields
+
+def extract_field_refs(lines):
+    """Field IDs referenced through `fieldId: '...'` in one component"""
+    refs = set()
+    for line in lines:
+        if 'fieldId' not in line:
+            continue
+        for match in FIELD_ID_PATTERN.finditer(line):
+            refs.add(match.group(1))
+    return refs
+
+def is_collected_by_wizard(source_path, wizard_fields):
+    """True if a wizard field collects source_path itself or one of its parents"""
+    path = source_path
+    while '.' in path:
+        if path in wizard_fields:
+            return True
+        path = path.rsplit('.', 1)[0]
+    return False
+
+# Extractor per kind of file; each takes the file's text and returns plain,
+# picklable data so that it can run on a worker process.
+EXTRACTORS = {
+    'mapping': extract_service_mapping,
+    'types': extract_interfaces,
+    'registry': lambda content: index_field_registry(content.splitlines()),
+    'wizard': lambda content: index_wizard_fields(content.splitlines()),
+    'field_refs': lambda content: extract_field_refs(content.splitlines()),
+}
+
+def extract_file(kind, data):
+    """Decode one file's bytes and run its extractor"""
+    return EXTRACTORS[kind](data.decode('utf-8'))
+
+# Extraction results of the current process, by content:
+# (kind, sha256 hex digest) -> result
+_extracted = {}
+
+def extract_paths(base_dir, batch, cache=None):
+    """Read, hash and extract a batch of one checkout's files (worker process entry point).
+
+    `batch` is a list of (kind, relative path). Returns ((kind, digest),
+    result) per file, or None for a file that does not exist. Results are
+    cached by content hash in `cache` (default: a per-process cache), so a
+    file shared by many checkouts is extracted once per process.
+    """
+    cache = _extracted if cache is None else cache
+    results = []
+    for kind, path in batch:
+        try:
+            with open(os.path.join(base_dir, path), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            results.append(None)
+            continue
+        key = (kind, hashlib.sha256(data).hexdigest())
+        if key not in cache:
+            cache[key] = extract_file(kind, data)
+        results.append((key, cache[key]))
+    return results
+
+def list_source_files(base_dir):
+    """(kind, relative POSIX path) of every file the audit extracts from one checkout.
+
+    The mapping, registry, wizard and type files are always listed; whether
+    they exist is only found out when they are read.
+    """
+    files = [
+        ('mapping', MAPPING_FILE.as_posix()),
+        ('registry', REGISTRY_FILE.as_posix()),
+        ('wizard', WIZARD_FILE.as_posix()),
+    ]
+    files.extend(('types', (TYPES_SUBDIR / type_file).as_posix()) for type_file in TYPE_FILES)
+
+    # os.walk and plain strings: rglob() and Path objects dominate the
+    # per-checkout cost of a batch of forks
+    prefix = len(str(base_dir)) + 1
+    tsx_paths = []
+    for dir_path, _, file_names in os.walk(os.path.join(base_dir, PHASE2_SUBDIR)):
+        rel_dir = dir_path[prefix:].replace(os.sep, '/')
+        tsx_paths.extend(f"{rel_dir}/{name}" for name in file_names if name.endswith('.tsx'))
+    files.extend(('field_refs', path) for path in sorted(tsx_paths))
+
+    return files
+
+def assemble_sources(base_dir, extracted, missing=()):
+    """Combine the extraction results of one checkout; every check reads from this dict
+
+    `extracted` holds (kind, relative POSIX path, result) per file.
+    """
+    sources = {
+        'base_dir': base_dir,
+        'missing': list(missing),
+        'component_map': {},
+        'category_map': {},
+        'imports': {},
+        'component_files': {},
+        'interfaces': defaultdict(list),
+        'registry': (defaultdict(list), [], defaultdict(set), defaultdict(list)),
+        'wizard_fields': defaultdict(list),
+        'field_refs': defaultdict(set),
+    }
+    components_subdir = COMPONENTS_SUBDIR.as_posix()
+
+    for kind, path, result in extracted:
+        if kind == 'mapping':
+            sources.update(result)
+        elif kind == 'types':
+            sources['interfaces'][TYPE_FILES[path.rpartition('/')[2]]].extend(result)
+        elif kind == 'registry':
+            sources['registry'] = result
+        elif kind == 'wizard':
+            sources['wizard_fields'] = result
+        elif kind == 'field_refs':
+            for field_id in result:
+                sources['field_refs'][field_id].add(path)
+
+            # Service components are the .tsx files directly inside a
+            # category directory of COMPONENTS_SUBDIR
+            category_path, _, file_name = path.rpartition('/')
+            parent_path, _, category_dir = category_path.rpartition('/')
+            if parent_path == components_subdir:
+                sources['component_files'][file_name[:-len('.tsx')]] = {
+                    'path': path,
+                    'category_dir': category_dir,
+                    'exists': True
+                }
+
+    return sources
+
+def extract_roots(roots, jobs=1, stats=None):
+    """Yield (root, sources) for every checkout as soon as its files are extracted.
+
+    Files are read, hashed and extracted in batches; each process caches
+    results by content hash, so a file that is byte-identical across
+    checkouts is extracted at most once per process, and every checkout
+    shares the same result object. With jobs > 1 the batches of all
+    checkouts run on a shared process pool and checkouts are yielded in the
+    order they complete. `stats` (if given) is updated with the number of
+    files and distinct files as extraction proceeds.
+    """
+    stats = {} if stats is None else stats
+    stats.update(files=0, unique_files=0)
+    shared = {}  # (kind, digest) -> first result received for that content
+
+    def assemble(root, batches):
+        extracted = []
+        missing = []
+        for batch, results in batches:
+            for (kind, path), result in zip(batch, results):
+                if result is None:
+                    if kind in REQUIRED_KINDS:
+                        missing.append(path)
+                    continue
+                key, value = result
+                extracted.append((kind, path, shared.setdefault(key, value)))
+        stats['files'] += len(extracted)
+        stats['unique_files'] = len(shared)
+        return assemble_sources(root, extracted, missing)
+
+    if jobs <= 1:
+        cache = {}
+        for root in roots:
+            files = list_source_files(root)
+            yield root, assemble(root, [(files, extract_paths(str(root), files, cache))])
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        tasks = {}  # future -> (root, batch index, batch)
+        remaining = {}  # root -> number of unfinished batches
+        finished = defaultdict(list)  # root -> [(batch index, batch, results)]
+        for root in roots:
+            files = list_source_files(root)
+            batches = [files[i:i + EXTRACT_BATCH_SIZE] for i in range(0, len(files), EXTRACT_BATCH_SIZE)]
+            for index, batch in enumerate(batches):
+                tasks[pool.submit(extract_paths, str(root), batch)] = (root, index, batch)
+            remaining[root] = len(batches)
+
+        for future in as_completed(tasks):
+            root, index, batch = tasks[future]
+            finished[root].append((index, batch, future.result()))
+            remaining[root] -= 1
+            if not remaining[root]:
+                batches = sorted(finished.pop(root), key=lambda item: item[0])
+                yield root, assemble(root, [(batch, results) for _, batch, results in batches])
+
+def read_roots_file(roots_file):
+    """Checkout paths listed one per line, relative to the list file's directory.
+
+    Blank lines and lines whose first non-blank character is '#' are ignored;
+    a '#' anywhere else is part of the path.
+    """
+    roots_file = Path(roots_file)
+    roots = []
+    for line in roots_file.read_text(encoding='utf-8').splitlines():
+        line = line.strip()
+        if line and not line.startswith('#'):
+            roots.append(roots_file.parent / line)
+    return roots
+
+def check_sources(sources):
+    """Report missing source files and how many entries were extracted from each source"""
+    for path in sources['missing']:
+        yield Finding('sources', ERROR, f"{path}: file not found", path=path)
+    yield Finding('sources', INFO, f"SERVICE_COMPONENT_MAP: {len(sources['component_map'])} entries")
+    yield Finding('sources', INFO, f"SERVICE_CATEGORY_MAP: {len(sources['category_map'])} entries")
+    yield Finding('sources', INFO, f"Component files found: {len(sources['component_files'])} files")
+    yield Finding('sources', INFO,
+                  f"TypeScript interfaces found: {sum(len(v) for v in sources['interfaces'].values())} interfaces")
+    yield Finding('sources', INFO, f"Import statements: {len(sources['imports'])} imports")
+
+def check_integrity(sources):
+    """Both service maps have the expected size and the same service IDs"""
+    component_map = sources['component_map']
+    category_map = sources['category_map']
+    path = MAPPING_FILE.as_posix()
+    expected_total = sum(EXPECTED_SERVICES.values())
 
     # Check if counts match expected
-    if len(component_map) != 59:
-        issues.append(f"ERROR: SERVICE_COMPONENT_MAP has {len(component_map)} entries (expected 59)")
+    if len(component_map) != expected_total:
+        yield Finding('integrity', ERROR,
+                      f"SERVICE_COMPONENT_MAP has {len(component_map)} entries (expected {expected_total})",
+                      subject='SERVICE_COMPONENT_MAP', path=path)
 
-    if len(category_map) != 59:
-        issues.append(f"ERROR: SERVICE_CATEGORY_MAP has {len(category_map)} entries (expected 59)")
+    if len(category_map) != expected_total:
+        yield Finding('integrity', ERROR,
+                      f"SERVICE_CATEGORY_MAP has {len(category_map)} entries (expected {expected_total})",
+                      subject='SERVICE_CATEGORY_MAP', path=path)
 
     # Check if all service IDs in COMPONENT_MAP exist in CATEGORY_MAP
-    missing_in_category = set(component_map.keys()) - set(category_map.keys())
-    if missing_in_category:
-        issues.append(f"ERROR: {len(missing_in_category)} services in COMPONENT_MAP missing from CATEGORY_MAP: {missing_in_category}")
+    for service_id in sorted(set(component_map) - set(category_map)):
+        yield Finding('integrity', ERROR, f"{service_id}: in COMPONENT_MAP but missing from CATEGORY_MAP",
+                      subject=service_id, path=path)
 
     # Check if all service IDs in CATEGORY_MAP exist in COMPONENT_MAP
-    missing_in_component = set(category_map.keys()) - set(component_map.keys())
-    if missing_in_component:
-        issues.append(f"ERROR: {len(missing_in_component)} services in CATEGORY_MAP missing from COMPONENT_MAP: {missing_in_component}")
+    for service_id in sorted(set(category_map) - set(component_map)):
+        yield Finding('integrity', ERROR, f"{service_id}: in CATEGORY_MAP but missing from COMPONENT_MAP",
+                      subject=service_id, path=path)
 
-    for issue in issues:
-        print(f"  {issue}")
+def check_components(sources):
+    """Every mapped component is imported and has a .tsx file"""
+    imports = sources['imports']
+    component_files = sources['component_files']
+    path = MAPPING_FILE.as_posix()
 
-    if not issues:
-        print("  ✓ Basic integrity checks passed")
-    print()
-
-    # Step 3: Component-level validation
-    print("Step 3: Component File Validation...")
-
-    component_issues = []
-    for service_id, component_name in component_map.items():
+    for service_id, component_name in sources['component_map'].items():
         # Check if import exists
         if component_name not in imports:
-            component_issues.append(f"  X {service_id}: No import statement for {component_name}")
-        else:
-            import_path = imports[component_name]
-            # Verify file exists at import path
-            # Import path is relative, like '../components/Phase2/ServiceRequirements/Automations/AutoLeadResponseSpec'
-            # We need to check if this file exists
+            yield Finding('components', ERROR, f"{service_id}: No import statement for {component_name}",
+                          subject=service_id, path=path)
 
         # Check if component file exists
         if component_name not in component_files:
-            component_issues.append(f"  X {service_id}: Component file {component_name}.tsx not found")
-
-    for issue in component_issues:
-        print(issue)
-
-    print()
+            yield Finding('components', ERROR, f"{service_id}: Component file {component_name}.tsx not found",
+                          subject=service_id, path=path)
 
-    # Step 4: Category validation
-    print("Step 4: Category Validation...")
+def check_categories(sources):
+    """Every service's component lives in its category's directory"""
+    component_map = sources['component_map']
+    component_files = sources['component_files']
 
-    category_dir_map = {
-        'automations': 'Automations',
-        'aiAgentServices': 'AIAgents',
-        'integrationServices': 'Integrations',
-        'systemImplementations': 'SystemImplementations',
-        'additionalServices': 'AdditionalServices'
-    }
-
-    category_issues = []
-    for service_id, category in category_map.items():
-        if category in category_dir_map:
-            expected_dir = category_dir_map[category]
+    for service_id, category in sources['category_map'].items():
+        if category in CATEGORY_DIR_MAP:
+            expected_dir = CATEGORY_DIR_MAP[category]
             component_name = component_map.get(service_id)
             if component_name and component_name in component_files:
                 actual_dir = component_files[component_name]['category_dir']
                 if actual_dir != expected_dir:
-                    category_issues.append(f"  X {service_id}: Category mismatch - mapped to '{category}' but file is in '{actual_dir}/'")
+                    yield Finding('categories', ERROR,
+                                  f"{service_id}: Category mismatch - mapped to '{category}' "
+                                  f"but file is in '{actual_dir}/'",
+                                  subject=service_id, path=component_files[component_name]['path'])
+        else:
+            yield Finding('categories', ERROR, f"{service_id}: Invalid category '{category}'",
+                          subject=service_id, path=MAPPING_FILE.as_posix())
+
+def check_fields(sources):
+    """Cross-index FIELD_REGISTRY, wizard steps and Phase 2 fieldId references"""
+    registry_fields, id_mismatches, source_paths, used_by = sources['registry']
+    component_map = sources['component_map']
+    wizard_fields = sources['wizard_fields']
+    field_refs = sources['field_refs']
+    registry_path = REGISTRY_FILE.as_posix()
+    wizard_path = WIZARD_FILE.as_posix()
+
+    yield Finding('fields', INFO, f"Registry fields: {len(registry_fields)}")
+    yield Finding('fields', INFO, f"Wizard step fields: {len(wizard_fields)}")
+    yield Finding('fields', INFO, f"Field IDs referenced by Phase 2 components: {len(field_refs)}")
+
+    for field_id in sorted(set(field_refs) - set(registry_fields)):
+        for file_path in sorted(field_refs[field_id]):
+            yield Finding('fields', ERROR, f"Undefined field '{field_id}' referenced in {file_path}",
+                          subject=field_id, path=file_path)
+
+    # Fields listed in usedBy are rendered at runtime by getFieldsForService()
+    used = set(field_refs) | {field_id for field_id, service_ids in used_by.items() if service_ids}
+    for field_id in sorted(set(registry_fields) - used):
+        yield Finding('fields', WARNING,
+                      f"Unused field '{field_id}' (no usedBy services and no Phase 2 component references it)",
+                      subject=field_id, path=registry_path)
+
+    for field_id, service_ids in sorted(used_by.items()):
+        for service_id in service_ids:
+            if service_id != '*' and service_id not in component_map:
+                yield Finding('fields', ERROR,
+                              f"Registry field '{field_id}' is used by unknown service '{service_id}'",
+                              subject=field_id, path=registry_path)
+
+    for field_id, lines in sorted(registry_fields.items()):
+        if len(lines) > 1:
+            yield Finding('fields', ERROR, f"Duplicate registry field '{field_id}' at lines {lines}",
+                          subject=field_id, path=registry_path)
+
+    for key, field_id, line_no in id_mismatches:
+        yield Finding('fields', ERROR, f"Registry key '{key}' declares id '{field_id}' (line {line_no})",
+                      subject=key, path=registry_path)
+
+    for path, lines in sorted(wizard_fields.items()):
+        if len(lines) > 1:
+            yield Finding('fields', ERROR, f"Duplicate wizard field '{path}' at lines {lines}",
+                          subject=path, path=wizard_path)
+
+    for path, field_ids in sorted(source_paths.items()):
+        if not is_collected_by_wizard(path, wizard_fields):
+            yield Finding('fields', WARNING,
+                          f"Source path '{path}' of {sorted(field_ids)} is not collected by any wizard step",
+                          subject=path, path=registry_path)
+
+def check_service_counts(sources):
+    """Compare service counts, in total and per category, against EXPECTED_SERVICES"""
+    component_map = sources['component_map']
+    category_map = sources['category_map']
+    expected_total = sum(EXPECTED_SERVICES.values())
+
+    yield Finding('summary', INFO, f"Total services in mappings: {len(component_map)}")
+    yield Finding('summary', INFO, f"Expected services: {expected_total}")
+
+    counts = defaultdict(int)
+    for category in category_map.values():
+        counts[category] += 1
+
+    for category, expected in EXPECTED_SERVICES.items():
+        actual = counts[category]
+        if actual != expected:
+            yield Finding('summary', WARNING,
+                          f"{category}: {actual} services (expected {expected}, difference {actual - expected:+d})",
+                          subject=category)
         else:
-            category_issues.append(f"  X {service_id}: Invalid category '{category}'")
-
-    for issue in category_issues:
-        print(issue)
-
-    print()
-
-    # Step 5: Summary
-    print("Step 5: Summary...")
-    print(f"  Total services in mappings: {len(component_map)}")
-    print(f"  Expected services: 59")
-    print(f"  Difference: {len(component_map) - 59:+d}")
-    print()
-
-    # List all service IDs by category
-    print("Services by Category:")
-    for category in ['automations', 'aiAgentServices', 'integrationServices', 'systemImplementations', 'additionalServices']:
-        services_in_category = [sid for sid, cat in category_map.items() if cat == category]
-        expected = EXPECTED_SERVICES[category]
-        print(f"  {category}: {len(services_in_category)} services (expected {expected})")
-        if len(services_in_category) != expected:
-            print(f"    Difference: {len(services_in_category) - expected:+d}")
-
-    print()
-    print("="*80)
-    print("AUDIT COMPLETE")
-    print("="*80)
+            yield Finding('summary', INFO, f"{category}: {actual} services (expected {expected})",
+                          subject=category)
+
+def check_batch(services, stats):
+    """Summarize a multi-checkout run and how much extraction was shared"""
+    for root, count in services.items():
+        yield Finding('batch', INFO, f"{root}: {count} services", root=str(root))
+    yield Finding('batch', INFO,
+                  f"Extracted {stats['unique_files']} distinct files for {stats['files']} files "
+                  f"across {len(services)} checkouts")
+
+def root_checks(sources):
+    """The checks run against one checkout"""
+    return [
+        ('sources', "Extracting data from all sources", partial(check_sources, sources)),
+        ('integrity', "Basic Integrity Checks", partial(check_integrity, sources)),
+        ('components', "Component File Validation", partial(check_components, sources)),
+        ('categories', "Category Validation", partial(check_categories, sources)),
+        ('fields', "Field Registry Cross-Index", partial(check_fields, sources)),
+        ('summary', "Summary", partial(check_service_counts, sources)),
+    ]
+
+def iter_checks(roots, jobs=1):
+    """Build the checks lazily, so extraction happens while results are reported.
+
+    A single checkout is extracted inside its first check. With several
+    checkouts, each one's checks are produced as soon as its files are
+    extracted, followed by a batch summary.
+    """
+    stats = {}
+    if len(roots) == 1:
+        sources = {}
+
+        def extract_sources():
+            for _, extracted in extract_roots(roots, jobs, stats):
+                sources.update(extracted)
+            return check_sources(sources)
+
+        # The remaining checks share `sources`, filled in by the first one
+        yield 'sources', "Extracting data from all sources", extract_sources
+        yield from root_checks(sources)[1:]
+        return
+
+    services = {}
+    for root, sources in extract_roots(roots, jobs, stats):
+        services[root] = len(sources['component_map'])
+        for name, description, check in root_checks(sources):
+            yield f"{root}:{name}", f"[{root}] {description}", partial(for_root, str(root), check)
+    yield 'batch', "Batch Summary", partial(check_batch, services, stats)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Phase 2 service requirements system audit")
+    parser.add_argument('roots', nargs='*', type=Path,
+                        help="discovery-assistant checkouts to audit (default: BASE_DIR)")
+    parser.add_argument('--roots-file', help="file listing one checkout path per line; relative paths are resolved "
+                             "against the file's directory, lines starting with '#' are comments")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="worker processes for extraction (default: CPU count when auditing several checkouts)")
+    add_output_arguments(parser)
+    args = parser.parse_args(argv)
+
+    roots = list(args.roots)
+    if args.roots_file:
+        if not Path(args.roots_file).is_file():
+            parser.error(f"roots file not found: {args.roots_file}")
+        roots.extend(read_roots_file(args.roots_file))
+    roots = list(dict.fromkeys(roots)) or [BASE_DIR]
+    for root in roots:
+        if not root.is_dir():
+            parser.error(f"not a directory: {root}")
+    jobs = args.jobs or ((os.cpu_count() or 1) if len(roots) > 1 else 1)
+
+    return report("PHASE 2 SERVICE REQUIREMENTS SYSTEM AUDIT", iter_checks(roots, jobs), args)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
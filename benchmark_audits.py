@@ -0,0 +1,347 @@
+"""
+Audit Scaling Benchmark
+Generates synthetic discovery-assistant trees (service maps, type files,
+component files, field registry and wizard steps) of configurable size and runs
+audit_script.py / detailed_audit.py against them, recording time and memory
+for each size. Exits non-zero if either audit grows worse than linearly.
+
+A second benchmark audits a dozen near-identical forks of the smallest tree
+in one audit_script run on a process pool. It fails unless identical files
+are extracted as one distinct file, and unless the run costs less than
+--fork-limit times auditing the forks one by one. Every fork is still read
+and hashed, so the run cannot cost as little as a single fork.
+
+Usage:
+    python benchmark_audits.py                      # 1k and 10k services
+    python benchmark_audits.py --sizes 1000 10000 100000
+    python benchmark_audits.py --forks 24 --jobs 8
+"""
+
+import argparse
+import contextlib
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import audit_script
+import detailed_audit
+
+DEFAULT_SIZES = [1000, 10000]
+
+# Maximum allowed log-log slope of cost vs. service count (1.0 == linear)
+DEFAULT_TOLERANCE = 0.25
+
+# Forks audited together, and their allowed cost relative to separate runs
+DEFAULT_FORKS = 12
+DEFAULT_FORK_LIMIT = 1.0
+DEFAULT_JOBS = max(2, os.cpu_count() or 1)
+
+# category -> (component directory, type file, service id prefix)
+CATEGORIES = {
+    'automations': ('Automations', 'automationServices.ts', 'auto'),
+    'aiAgentServices': ('AIAgents', 'aiAgentServices.ts', 'ai'),
+    'integrationServices': ('Integrations', 'integrationServices.ts', 'int'),
+    'systemImplementations': ('SystemImplementations', 'systemImplementationServices.ts', 'impl'),
+    'additionalServices': ('AdditionalServices', 'additionalServices.ts', 'add'),
+}
+
+COMPONENT_TEMPLATE = '''import React from 'react';
+import {{ useSmartField }} from '../../../../hooks/useSmartField';
+
+export function {component_name}() {{
+  const field = useSmartField<string>({{
+    fieldId: '{field_id}',
+    serviceId: '{service_id}',
+  }});
+
+  return <div dir="rtl">{{field.value}}</div>;
+}}
+'''
+
+INTERFACE_TEMPLATE = '''export interface {interface_name} {{
+  enabled: boolean;
+  notes?: string;
+}}
+
+'''
+
+REGISTRY_FIELD_TEMPLATE = '''  {field_id}: {{
+    id: '{field_id}',
+    type: 'text',
+    primarySource: {{
+      path: 'modules.{module_id}.{field_name}',
+      phase: 'phase1',
+    }},
+  }},
+
+'''
+
+WIZARD_STEP_TEMPLATE = '''  {{
+    id: '{module_id}-step-{index}',
+    moduleId: '{module_id}',
+    fields: [
+      {{
+        name: '{field_name}',
+        component: TextField,
+      }},
+    ],
+  }},
+'''
+
+
+def generate_tree(root, size):
+    """Write a synthetic project with `size` services under `root`"""
+    config_dir = root / "src" / "config"
+    components_dir = root / "src" / "components" / "Phase2" / "ServiceRequirements"
+    types_dir = root / "src" / "types"
+    config_dir.mkdir(parents=True)
+    types_dir.mkdir(parents=True)
+
+    categories = list(CATEGORIES.items())
+    imports = []
+    component_entries = []
+    category_entries = []
+    interfaces = {category: [] for category in CATEGORIES}
+    registry_fields = []
+    wizard_steps = []
+
+    for i in range(size):
+        category, (dir_name, _, prefix) = categories[i % len(categories)]
+        service_id = f"{prefix}-synthetic-{i}"
+        component_name = f"Synthetic{dir_name}{i}Spec"
+        field_id = f"synthetic_field_{i}"
+        field_name = f"syntheticField{i}"
+        module_id = f"{prefix}Module"
+
+        category_dir = components_dir / dir_name
+        category_dir.mkdir(parents=True, exist_ok=True)
+        (category_dir / f"{component_name}.tsx").write_text(
+            COMPONENT_TEMPLATE.format(
+                component_name=component_name, service_id=service_id, field_id=field_id
+            ),
+            encoding='utf-8'
+        )
+
+        imports.append(
+            f"import {{ {component_name} }} from "
+            f"'../components/Phase2/ServiceRequirements/{dir_name}/{component_name}';\n"
+        )
+        component_entries.append(f"  '{service_id}': {component_name},\n")
+        category_entries.append(f"  '{service_id}': '{category}',\n")
+        interfaces[category].append(
+            INTERFACE_TEMPLATE.format(interface_name=f"{component_name[:-4]}Requirements")
+        )
+        registry_fields.append(REGISTRY_FIELD_TEMPLATE.format(
+            field_id=field_id, module_id=module_id, field_name=field_name
+        ))
+        wizard_steps.append(WIZARD_STEP_TEMPLATE.format(
+            module_id=module_id, field_name=field_name, index=i
+        ))
+
+    mapping = (
+        "import React from 'react';\n\n"
+        + "".join(imports)
+        + "\nexport const SERVICE_COMPONENT_MAP: Record<string, React.FC> = {\n"
+        + "".join(component_entries)
+        + "};\n\nexport const SERVICE_CATEGORY_MAP: Record<string, string> = {\n"
+        + "".join(category_entries)
+        + "};\n"
+    )
+    (config_dir / "serviceComponentMapping.ts").write_text(mapping, encoding='utf-8')
+
+    registry = (
+        "export const FIELD_REGISTRY: Record<string, RegistryField> = {\n"
+        + "".join(registry_fields)
+        + "};\n"
+    )
+    (config_dir / "fieldRegistry.ts").write_text(registry, encoding='utf-8')
+
+    wizard = (
+        "export const WIZARD_STEPS: WizardStep[] = [\n"
+        + "".join(wizard_steps)
+        + "];\n"
+    )
+    (config_dir / "wizardSteps.ts").write_text(wizard, encoding='utf-8')
+
+    for category, (_, type_file, _) in CATEGORIES.items():
+        (types_dir / type_file).write_text("".join(interfaces[category]), encoding='utf-8')
+
+
+def generate_forks(tree, forks_dir, count):
+    """Copy `tree` into `count` forks, each with one fork-specific component"""
+    forks = []
+    for i in range(count):
+        fork = forks_dir / f"fork-{i}"
+        shutil.copytree(tree, fork)
+        component_dir = fork / "src" / "components" / "Phase2" / "ServiceRequirements" / "AdditionalServices"
+        (component_dir / f"Fork{i}CustomSpec.tsx").write_text(
+            COMPONENT_TEMPLATE.format(
+                component_name=f"Fork{i}CustomSpec", service_id=f"add-fork-{i}", field_id=f"fork_field_{i}"
+            ),
+            encoding='utf-8'
+        )
+        forks.append(fork)
+    return forks
+
+
+@contextlib.contextmanager
+def pointed_at(module, root):
+    """Temporarily point detailed_audit's path constants at `root`"""
+    saved = module.BASE_DIR, module.CONFIG_DIR
+    module.BASE_DIR, module.CONFIG_DIR = root, root / "src" / "config"
+    try:
+        yield
+    finally:
+        module.BASE_DIR, module.CONFIG_DIR = saved
+
+
+def run_audit_script(*roots, jobs=None):
+    argv = [str(root) for root in roots]
+    if jobs:
+        argv += ['--jobs', str(jobs)]
+    audit_script.main(argv)
+
+
+def run_detailed_audit(root):
+    # detailed_audit takes no checkout argument
+    with pointed_at(detailed_audit, root):
+        detailed_audit.main([])
+
+
+AUDITS = {
+    'audit_script': run_audit_script,
+    'detailed_audit': run_detailed_audit,
+}
+
+
+def fork_sharing(forks, jobs):
+    """(files, distinct files) that audit_script extracts for `forks` in one run"""
+    stats = {}
+    for _ in audit_script.extract_roots(forks, jobs, stats):
+        pass
+    return stats['files'], stats['unique_files']
+
+
+def measure(run, *args, memory=True, **kwargs):
+    """Call run(*args, **kwargs), returning (seconds, peak bytes or None)"""
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        # Time and memory are measured in separate runs: tracemalloc
+        # slows allocation-heavy code enough to distort the timing curve.
+        start = time.perf_counter()
+        run(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+
+        if not memory:
+            return elapsed, None
+
+        tracemalloc.start()
+        try:
+            run(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return elapsed, peak
+
+
+def growth_exponent(sizes, values):
+    """Least-squares slope of log(value) against log(size)"""
+    points = [(math.log(s), math.log(max(v, 1e-9))) for s, v in zip(sizes, values)]
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    return numerator / denominator if denominator else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the audit scripts at synthetic catalog sizes")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="service counts to generate (default: %(default)s)")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed growth exponent above linear (default: %(default)s)")
+    parser.add_argument('--forks', type=int, default=DEFAULT_FORKS,
+                        help="near-identical forks audited in one run (default: %(default)s)")
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS,
+                        help="worker processes for the fork run (default: %(default)s)")
+    parser.add_argument('--fork-limit', type=float, default=DEFAULT_FORK_LIMIT,
+                        help="allowed time of the fork run relative to auditing each fork "
+                             "separately (default: %(default)s)")
+    args = parser.parse_args()
+
+    sizes = sorted(set(args.sizes))
+    results = {name: {'time': [], 'memory': []} for name in AUDITS}
+
+    print("=" * 80)
+    print("AUDIT SCALING BENCHMARK")
+    print("=" * 80)
+    print()
+    print(f"{'audit':<16} {'services':>10} {'time (s)':>12} {'peak (MiB)':>12}")
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix=f"audit-bench-{size}-") as tmp:
+            root = Path(tmp)
+            generate_tree(root, size)
+            for name, run in AUDITS.items():
+                elapsed, peak = measure(run, root)
+                results[name]['time'].append(elapsed)
+                results[name]['memory'].append(peak)
+                print(f"{name:<16} {size:>10} {elapsed:>12.4f} {peak / 2**20:>12.2f}")
+
+    failures = []
+    print()
+    if len(sizes) < 2:
+        print("Need at least two sizes to estimate growth")
+    else:
+        limit = 1.0 + args.tolerance
+        print(f"Growth exponents (limit {limit:.2f}):")
+        for name, curves in results.items():
+            for metric, values in curves.items():
+                exponent = growth_exponent(sizes, values)
+                marker = "OK" if exponent <= limit else "X"
+                print(f"  {marker:<2} {name} {metric}: {exponent:.2f}")
+                if exponent > limit:
+                    failures.append(f"{name} {metric}")
+
+    print()
+    print(f"Forks ({sizes[0]} services each, --jobs {args.jobs}):")
+    with tempfile.TemporaryDirectory(prefix="audit-bench-forks-") as tmp:
+        tree = Path(tmp) / "tree"
+        generate_tree(tree, sizes[0])
+        forks = generate_forks(tree, Path(tmp), args.forks)
+        single, _ = measure(run_audit_script, forks[0], memory=False)
+        batch, _ = measure(run_audit_script, *forks, jobs=args.jobs, memory=False)
+        files, distinct = fork_sharing(forks, args.jobs)
+
+    # Each fork adds a single fork-specific component to the shared tree
+    expected_distinct = files // args.forks + args.forks - 1
+    marker = "OK" if distinct == expected_distinct else "X"
+    print(f"  {marker:<2} {distinct} distinct files extracted for {files} files (expected {expected_distinct})")
+    if distinct != expected_distinct:
+        failures.append(f"{args.forks} forks extraction sharing")
+
+    separate = single * args.forks
+    ratio = batch / separate
+    marker = "OK" if ratio <= args.fork_limit else "X"
+    print(f"  1 fork:           {single:8.4f} s")
+    print(f"  {args.forks} forks, one run: {batch:8.4f} s ({batch / single:.2f}x one fork)")
+    print(f"  {marker:<2} {ratio:.2f}x auditing each fork separately (limit {args.fork_limit:.2f}x)")
+    if ratio > args.fork_limit:
+        failures.append(f"{args.forks} forks time")
+
+    print()
+    if failures:
+        print(f"FAILED: {', '.join(failures)}")
+        return 1
+
+    print("All audits scale linearly and forks share extraction")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,9 +2,14 @@
 Detailed Service ID Audit - Lists all service IDs by category
 """
 
+import argparse
 import re
+import sys
+from functools import partial
 from pathlib import Path
 
+from audit_results import INFO, WARNING, Finding, TextReporter, add_output_arguments, report
+
 BASE_DIR = Path(r"C:\Users\eyaly\Desktop\Businesses\eym-group_n8n\internal_app\discovery-assistant")
 CONFIG_DIR = BASE_DIR / "src" / "config"
 
@@ -100,7 +105,87 @@ EXPECTED_SERVICES = {
     ]
 }
 
-def main():
+# Documented total; EXPECTED_SERVICES is still missing service #20
+EXPECTED_TOTAL = 59
+
+EXTRA_PREFIX = "EXTRA service ID: "
+MISSING_PREFIX = "MISSING service ID: "
+
+def check_category(category, actual):
+    """Compare the actual service IDs of one category with the documented list"""
+    expected = EXPECTED_SERVICES.get(category, [])
+    actual = sorted(actual)
+
+    yield Finding(category, INFO, f"Expected: {len(expected)} services", subject=category)
+    # The full listing travels as details, not as one finding per service
+    yield Finding(category, INFO, f"Actual: {len(actual)} services", subject=category, details=tuple(actual))
+    severity = WARNING if len(actual) != len(expected) else INFO
+    yield Finding(category, severity, f"Difference: {len(actual) - len(expected):+d}", subject=category)
+
+    # Find extra services (in actual but not in expected)
+    for service_id in sorted(set(actual) - set(expected)):
+        yield Finding(category, WARNING, f"{EXTRA_PREFIX}{service_id}", subject=service_id)
+
+    # Find missing services (in expected but not in actual)
+    for service_id in sorted(set(expected) - set(actual)):
+        yield Finding(category, WARNING, f"{MISSING_PREFIX}{service_id}", subject=service_id)
+
+def check_totals(category_map):
+    """Compare the total number of services with the documented total"""
+    expected_total = EXPECTED_TOTAL
+    yield Finding('summary', INFO, f"Total expected services: {expected_total}")
+    yield Finding('summary', INFO, f"Total actual services: {len(category_map)}")
+    severity = WARNING if len(category_map) != expected_total else INFO
+    yield Finding('summary', severity, f"Difference: {len(category_map) - expected_total:+d}")
+
+class CategoryTextReporter(TextReporter):
+    """The audit's original text layout: a banner per category, grouped
+    EXTRA / MISSING lists and a numbered listing of the actual service IDs"""
+
+    def start_check(self, check, description):
+        self.extra = []
+        self.missing = []
+        self.listing = None
+        self._write()
+        self._write("=" * self.width)
+        self._write(description)
+        self._write("=" * self.width)
+
+    def finding(self, finding):
+        if finding.message.startswith(EXTRA_PREFIX):
+            self.extra.append(finding.subject)
+        elif finding.message.startswith(MISSING_PREFIX):
+            self.missing.append(finding.subject)
+        else:
+            self._write(finding.message)
+            if finding.details is not None:
+                self.listing = finding.details
+
+    def end_check(self, check):
+        if self.listing is None:
+            return
+        self._write()
+        for heading, service_ids in (("EXTRA", self.extra), ("MISSING", self.missing)):
+            if service_ids:
+                self._write(f"{heading} SERVICE IDs ({len(service_ids)}):")
+                for service_id in service_ids:
+                    self._write(f"  - {service_id}")
+                self._write()
+
+        extra = set(self.extra)
+        self._write(f"ALL ACTUAL SERVICE IDs ({len(self.listing)}):")
+        for i, service_id in enumerate(self.listing, 1):
+            marker = " [EXTRA]" if service_id in extra else ""
+            self._write(f"  {i:2d}. {service_id}{marker}")
+
+    def end(self, counts):
+        pass
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Detailed service ID audit - actual vs expected")
+    add_output_arguments(parser)
+    args = parser.parse_args(argv)
+
     category_map = extract_service_category_map()
 
     # Organize actual services by category
@@ -116,52 +201,13 @@ def main():
         if category in actual_by_category:
             actual_by_category[category].append(service_id)
 
-    print("=" * 100)
-    print("DETAILED SERVICE ID AUDIT - ACTUAL vs EXPECTED")
-    print("=" * 100)
-    print()
-
-    for category in ['automations', 'aiAgentServices', 'integrationServices', 'systemImplementations', 'additionalServices']:
-        expected = EXPECTED_SERVICES.get(category, [])
-        actual = sorted(actual_by_category[category])
-
-        print(f"\n{'='*100}")
-        print(f"CATEGORY: {category}")
-        print(f"{'='*100}")
-        print(f"Expected: {len(expected)} services")
-        print(f"Actual: {len(actual)} services")
-        print(f"Difference: {len(actual) - len(expected):+d}")
-        print()
-
-        # Find extra services (in actual but not in expected)
-        extra = set(actual) - set(expected)
-        if extra:
-            print(f"EXTRA SERVICE IDs ({len(extra)}):")
-            for service_id in sorted(extra):
-                print(f"  - {service_id}")
-            print()
-
-        # Find missing services (in expected but not in actual)
-        missing = set(expected) - set(actual)
-        if missing:
-            print(f"MISSING SERVICE IDs ({len(missing)}):")
-            for service_id in sorted(missing):
-                print(f"  - {service_id}")
-            print()
-
-        # Show all actual services
-        print(f"ALL ACTUAL SERVICE IDs ({len(actual)}):")
-        for i, service_id in enumerate(actual, 1):
-            marker = " [EXTRA]" if service_id in extra else ""
-            print(f"  {i:2d}. {service_id}{marker}")
-
-    print()
-    print("=" * 100)
-    print("SUMMARY")
-    print("=" * 100)
-    print(f"Total expected services: 59")
-    print(f"Total actual services: {len(category_map)}")
-    print(f"Difference: {len(category_map) - 59:+d}")
+    checks = [
+        (category, f"CATEGORY: {category}", partial(check_category, category, actual))
+        for category, actual in actual_by_category.items()
+    ]
+    checks.append(('summary', "SUMMARY", partial(check_totals, category_map)))
+    return report("DETAILED SERVICE ID AUDIT - ACTUAL vs EXPECTED", checks, args, width=100,
+                  reporters={'text': CategoryTextReporter})
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,393 @@
+"""
+Compact Flatted Decoder
+Decodes flatted (https://github.com/WebReflection/flatted) meeting backups for
+in-memory analysis.
+
+Without options, parse() returns the same structure as flatted.parse():
+dicts, lists and primitives, with shared references and cycles preserved.
+
+With `record_schema`, objects matching a schema shape are revived into
+generated __slots__ classes instead of dicts; with `auto_records=True`, key
+sets that repeat often within an archive get generated classes too. Records
+are read-only mappings: they support [], get(), keys(), items() and `in`, and
+compare equal to the equivalent dict, but they are not dict instances. Use
+to_builtin() to turn a revived graph back into plain dicts, e.g. for
+json.dumps() or flatted.stringify().
+
+Keys and short string values are interned, so hundreds of loaded archives
+share one copy of each. Record field names live on the class, so records
+carry no per-instance keys at all.
+
+Schemas use TypeScript-style field lists; a trailing '?' marks an optional
+field:
+
+    schema = {'ServiceEntry': ['serviceId', 'serviceName', 'requirements?']}
+    meeting = parse(backup_text, record_schema=schema, auto_records=True)
+
+Usage (memory comparison on real backups; exits 1 below --min-ratio):
+    python flatted_records.py backup1.json backup2.json ...
+"""
+
+import argparse
+import dis
+import json
+import keyword
+import sys
+import tracemalloc
+
+# String values longer than this are not interned (notes, transcripts, ...)
+INTERN_MAX_LENGTH = 128
+
+# With auto_records, a key set becomes a record class once it occurs this
+# many times in one archive
+AUTO_RECORD_MIN_COUNT = 8
+
+# main() fails when records do not cut retained memory at least this much.
+# A five-key dict takes 184 bytes against 72 for a five-slot record, so
+# meeting archives land around 2.5-2.8x; shared scalars make up the rest.
+TARGET_MEMORY_RATIO = 2.4
+
+_UNSET = object()
+
+# Shapes of discovery-assistant meeting backups (src/types/index.ts, phase2.ts
+# and the *ServiceEntry interfaces in src/types/*Services.ts)
+MEETING_RECORD_SCHEMA = {
+    'Meeting': [
+        'meetingId', 'id', 'clientName', 'date', 'modules', 'painPoints', 'phase', 'status',
+        'phaseHistory', 'timer?', 'notes?', 'totalROI?', 'customFieldValues?', 'wizardState?',
+        'dataVersion?', 'discoveryData?', 'implementationSpec?', 'developmentTracking?',
+        'conversationAnalysis?', 'supabaseId?', 'updatedAt?', 'zohoIntegration?',
+    ],
+    'Modules': [
+        'overview', 'leadsAndSales', 'customerService', 'operations', 'reporting', 'aiAgents',
+        'systems', 'roi', 'essentialDetails?', 'proposal?', 'planning?', 'requirements?',
+    ],
+    'ImplementationSpec': [
+        'systems', 'integrations', 'aiAgents', 'automations', 'acceptanceCriteria',
+        'totalEstimatedHours', 'completionPercentage', 'lastUpdated', 'updatedBy',
+        'aiAgentServices?', 'integrationServices?', 'systemImplementations?',
+        'additionalServices?', 'estimatedStartDate?', 'estimatedCompletionDate?',
+    ],
+    'ServiceEntry': [
+        'serviceId', 'requirements?', 'serviceName?', 'serviceNameHe?', 'serviceDisplayName?',
+        'category?', 'config?', 'status?', 'progress?', 'setupProgress?', 'completedAt?',
+        'createdAt?', 'updatedAt?', 'createdBy?', 'updatedBy?', 'notes?',
+        'estimatedCompletionDate?', 'technicalOwner?', 'businessOwner?',
+    ],
+    'PhaseTransition': ['fromPhase', 'toPhase', 'timestamp', 'transitionedBy?', 'notes?'],
+}
+
+
+class Record:
+    """Base class of generated records; behaves like a read-only mapping"""
+    __slots__ = ()
+    _fields = ()
+
+    def __getitem__(self, key):
+        value = getattr(self, key, _UNSET) if key in self._fields else _UNSET
+        if value is _UNSET:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return key in self._fields and hasattr(self, key)
+
+    def __iter__(self):
+        return (field for field in self._fields if hasattr(self, field))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __eq__(self, other):
+        if not isinstance(other, (Record, dict)):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    __hash__ = None
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [getattr(self, field) for field in self]
+
+    def items(self):
+        return [(field, getattr(self, field)) for field in self]
+
+    def _asdict(self):
+        """Shallow dict of the fields present on this record"""
+        return dict(self.items())
+
+    def to_dict(self):
+        """Deep copy of this record's graph as plain dicts and lists"""
+        return to_builtin(self)
+
+    def __repr__(self):
+        # Shallow on purpose: revived graphs may be cyclic
+        return f"{type(self).__name__}({', '.join(self)})"
+
+
+# Keys that would shadow the mapping methods above if used as slot names
+RESERVED_FIELDS = frozenset(dir(Record))
+
+
+def _valid_field(field):
+    # '__'-prefixed names are name-mangled (e.g. Mongoose's '__v') or clash
+    # with __dict__ / __weakref__, so they cannot be slots
+    return (field.isidentifier() and not keyword.iskeyword(field) and not field.startswith('__')
+            and field not in RESERVED_FIELDS)
+
+
+def make_record_class(name, fields):
+    """Generate the Record base class of a schema shape; optional fields end with '?'
+
+    Instances are created from per-key-set subclasses (see _variant) whose
+    __slots__ hold only the fields actually present, so optional fields cost
+    nothing when absent. isinstance() checks against the returned class work.
+    """
+    names = tuple(field.rstrip('?') for field in fields)
+    for field in names:
+        if not _valid_field(field):
+            raise ValueError(f"{name}: field '{field}' is not a valid record attribute name")
+    if len(set(names)) != len(names):
+        raise ValueError(f"{name}: duplicate fields")
+
+    cls = type(name, (Record,), {'__slots__': (), '_fields': names})
+    cls._required = frozenset(field for field in fields if not field.endswith('?'))
+    cls._variants = {}
+    return cls
+
+
+def _variant(cls, keys):
+    """Subclass of record class `cls` with slots for exactly `keys`"""
+    variant = cls._variants.get(keys)
+    if variant is None:
+        present = tuple(field for field in cls._fields if field in keys)
+        variant = type(cls.__name__, (cls,), {'__slots__': present, '_fields': present})
+        cls._variants[keys] = variant
+    return variant
+
+
+class AutoRecord(Record):
+    """Base class of records generated for frequent key sets (auto_records=True)"""
+    __slots__ = ()
+
+
+# Compiled schemas and auto record classes are shared across parse() calls so
+# that every archive decoded with the same schema uses the same classes.
+_compiled_schemas = {}
+_auto_classes = {}
+
+
+def _compile_schema(record_schema):
+    """List of (record class, all fields, required fields) in declaration order"""
+    frozen = tuple((name, tuple(fields)) for name, fields in (record_schema or {}).items())
+    compiled = _compiled_schemas.get(frozen)
+    if compiled is None:
+        compiled = []
+        for name, fields in frozen:
+            cls = make_record_class(name, fields)
+            compiled.append((cls, frozenset(cls._fields), cls._required))
+        _compiled_schemas[frozen] = compiled
+    return compiled
+
+
+def _auto_class(keys):
+    """Shared AutoRecord subclass for a key set, or None if a key can't be a slot"""
+    key_set = frozenset(keys)
+    if key_set not in _auto_classes:
+        fields = tuple(_interned(key) for key in keys)
+        if all(_valid_field(field) for field in fields):
+            _auto_classes[key_set] = type('AutoRecord', (AutoRecord,), {'__slots__': fields, '_fields': fields})
+        else:
+            _auto_classes[key_set] = None
+    return _auto_classes[key_set]
+
+
+def _interned(value):
+    # Every intern goes through here: retained_memory() leaves out this
+    # function's allocations, i.e. the growth of the interpreter-wide intern
+    # table, which is charged to whichever call happens to trigger a resize
+    return sys.intern(value)
+
+
+def _intern(value):
+    if len(value) <= INTERN_MAX_LENGTH:
+        return _interned(value)
+    return value
+
+
+def parse(value, *args, record_schema=None, auto_records=False, **kwargs):
+    """Decode a flatted string; extra args are passed to json.loads"""
+    entries = json.loads(value, *args, **kwargs)
+    if not entries:
+        raise ValueError("empty flatted payload")
+
+    schema = _compile_schema(record_schema)
+    shapes = {}  # tuple of keys -> record class, or None for dicts
+    revived = [_UNSET] * len(entries)
+    pending = []
+
+    frequent = set()
+    if auto_records:
+        counts = {}
+        for entry in entries:
+            if isinstance(entry, dict) and entry:
+                shape = tuple(entry)
+                counts[shape] = counts.get(shape, 0) + 1
+        frequent = {shape for shape, count in counts.items() if count >= AUTO_RECORD_MIN_COUNT}
+
+    def record_class(keys):
+        shape = tuple(keys)
+        if shape not in shapes:
+            key_set = frozenset(shape)
+            cls = next(
+                (cls for cls, fields, required in schema
+                 if required <= key_set and key_set <= fields),
+                None,
+            )
+            if cls:
+                shapes[shape] = _variant(cls, key_set)
+            elif shape in frequent:
+                shapes[shape] = _auto_class(shape)
+            else:
+                shapes[shape] = None
+        return shapes[shape]
+
+    def revive(index):
+        # Lists are reused from the JSON payload and patched in place (as
+        # flatted.parse does); dicts are rebuilt with interned keys and records
+        # are created empty. All are filled later from `pending`, so cycles
+        # resolve to the same object and deep graphs need no recursion.
+        result = revived[index]
+        if result is not _UNSET:
+            return result
+
+        entry = entries[index]
+        if isinstance(entry, str):
+            result = _intern(entry)
+        elif isinstance(entry, list):
+            result = entry
+            pending.append((result, entry))
+        elif isinstance(entry, dict):
+            cls = record_class(entry)
+            if cls:
+                result = cls.__new__(cls)
+            else:
+                result = {_interned(key): item for key, item in entry.items()}
+            pending.append((result, entry))
+        else:
+            result = entry
+
+        revived[index] = result
+        return result
+
+    root = revive(0)
+    while pending:
+        target, entry = pending.pop()
+        if isinstance(target, list):
+            for i, item in enumerate(entry):
+                if isinstance(item, str):
+                    target[i] = revive(int(item))
+        elif isinstance(target, dict):
+            for key, item in entry.items():
+                if isinstance(item, str):
+                    target[key] = revive(int(item))
+        else:
+            for key, item in entry.items():
+                setattr(target, key, revive(int(item)) if isinstance(item, str) else item)
+
+    return root
+
+
+def to_builtin(value):
+    """Copy a revived graph into plain dicts and lists.
+
+    Shared references and cycles are preserved, so the result has the same
+    shape as flatted.parse() would have returned.
+    """
+    copies = {}  # id of source container -> copy
+    pending = []
+
+    def copy(item):
+        if isinstance(item, (Record, dict, list)):
+            result = copies.get(id(item))
+            if result is None:
+                result = [] if isinstance(item, list) else {}
+                copies[id(item)] = result
+                pending.append((result, item))
+            return result
+        return item
+
+    root = copy(value)
+    while pending:
+        target, source = pending.pop()
+        if isinstance(target, list):
+            target.extend(copy(item) for item in source)
+        else:
+            for key, item in source.items():
+                target[key] = copy(item)
+
+    return root
+
+
+def retained_memory(texts, **options):
+    """Bytes still allocated after decoding every text with parse(**options)"""
+    intern_table = [
+        tracemalloc.Filter(False, __file__, line)
+        for _, line in dis.findlinestarts(_interned.__code__) if line is not None
+    ]
+    tracemalloc.start()
+    try:
+        loaded = [parse(text, **options) for text in texts]
+        snapshot = tracemalloc.take_snapshot().filter_traces(intern_table)
+    finally:
+        tracemalloc.stop()
+    del loaded
+    return sum(stat.size for stat in snapshot.statistics('filename'))
+
+
+def memory_ratio(texts):
+    """Retained memory as dicts divided by retained memory as records"""
+    # Warm up both modes so that one-off costs (record classes, shape caches)
+    # are not charged to whichever runs first
+    parse(texts[0])
+    parse(texts[0], record_schema=MEETING_RECORD_SCHEMA, auto_records=True)
+
+    as_dicts = retained_memory(texts)
+    as_records = retained_memory(texts, record_schema=MEETING_RECORD_SCHEMA, auto_records=True)
+    return as_dicts, as_records, as_dicts / max(as_records, 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare retained memory of dict and record decoding")
+    parser.add_argument('files', nargs='+', help="flatted meeting backups")
+    parser.add_argument('--min-ratio', type=float, default=TARGET_MEMORY_RATIO,
+                        help="fail when dicts/records memory falls below this (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    texts = []
+    for file_path in args.files:
+        with open(file_path, encoding='utf-8') as f:
+            texts.append(f.read())
+
+    as_dicts, as_records, ratio = memory_ratio(texts)
+
+    print(f"Backups loaded: {len(texts)}")
+    print(f"  dicts:   {as_dicts / 2**20:10.2f} MiB")
+    print(f"  records: {as_records / 2**20:10.2f} MiB")
+    print(f"  ratio:   {ratio:10.2f}x (target {args.min_ratio:.2f}x)")
+    if ratio < args.min_ratio:
+        print("FAILED: records do not reach the target memory ratio")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
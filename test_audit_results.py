@@ -0,0 +1,69 @@
+"""
+Tests for the shared finding model and reporters in audit_results.py
+"""
+
+import io
+import xml.dom.minidom
+
+from audit_results import ERROR, INFO, WARNING, Finding, JUnitReporter, TextReporter, exit_code, run_checks
+
+
+def counts(info=0, warning=0, error=0):
+    return {INFO: info, WARNING: warning, ERROR: error}
+
+
+def test_exit_code_respects_fail_on_threshold():
+    assert exit_code(counts(info=5), ERROR) == 0
+    assert exit_code(counts(warning=2), ERROR) == 0
+    assert exit_code(counts(warning=2), WARNING) == 1
+    assert exit_code(counts(warning=2, error=1), WARNING) == 3
+    assert exit_code(counts(error=1), ERROR) == 3
+
+
+def test_exit_code_for_errors_differs_from_usage_errors():
+    # argparse exits with 2 on usage errors
+    assert exit_code(counts(error=1), ERROR) != 2
+
+
+def test_junit_deduplicates_testcase_names_and_counts_failures():
+    def check():
+        yield Finding('fields', ERROR, "Duplicate registry field 'crm_system'")
+        yield Finding('fields', ERROR, "Duplicate registry field 'crm_system'")
+        yield Finding('fields', WARNING, "Duplicate registry field 'crm_system'")
+
+    stream = io.StringIO()
+    run_checks("AUDIT", [('fields', "Fields", check)], JUnitReporter(stream))
+
+    suite = xml.dom.minidom.parseString(stream.getvalue()).getElementsByTagName('testsuite')[0]
+    names = [testcase.getAttribute('name') for testcase in suite.getElementsByTagName('testcase')]
+    assert names == [
+        "Duplicate registry field 'crm_system'",
+        "Duplicate registry field 'crm_system' (2)",
+        "Duplicate registry field 'crm_system' (3)",
+    ]
+    assert suite.getAttribute('tests') == '3'
+    assert suite.getAttribute('failures') == '2'
+
+
+def test_junit_reports_empty_check_as_passed():
+    stream = io.StringIO()
+    run_checks("AUDIT", [('components', "Components", lambda: iter(()))], JUnitReporter(stream))
+
+    suite = xml.dom.minidom.parseString(stream.getvalue()).getElementsByTagName('testsuite')[0]
+    assert [testcase.getAttribute('name') for testcase in suite.getElementsByTagName('testcase')] == ['passed']
+    assert suite.getAttribute('failures') == '0'
+
+
+def test_text_markers_distinguish_severities():
+    def check():
+        yield Finding('fields', INFO, "Registry fields: 37")
+        yield Finding('fields', WARNING, "Unused field 'x'")
+        yield Finding('fields', ERROR, "Undefined field 'y'")
+
+    stream = io.StringIO()
+    run_checks("AUDIT", [('fields', "Fields", check)], TextReporter(stream))
+
+    lines = stream.getvalue().splitlines()
+    assert "  - Registry fields: 37" in lines
+    assert "  ! Unused field 'x'" in lines
+    assert "  X Undefined field 'y'" in lines
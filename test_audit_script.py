@@ -0,0 +1,143 @@
+"""
+Tests for the field registry / wizard steps indexers in audit_script.py
+"""
+
+from pathlib import Path
+
+import audit_script
+
+REGISTRY = """\
+import { RegistryField } from '../types/fieldRegistry';
+
+export const FIELD_REGISTRY: Record<string, RegistryField> = {
+  crm_system: {
+    id: 'crm_system',
+    usedBy: [
+      'auto-crm-update',
+      'int-simple',
+    ],
+    primarySource: {
+      path: 'modules.systems.detailedSystems[].specificSystem',
+      phase: 'phase1',
+    },
+  },
+
+  company_size: {
+    id: 'company-size',
+    usedBy: ['*'],
+  },
+
+  crm_system: {
+    id: 'crm_system',
+    usedBy: [],
+  },
+};
+
+export function getFieldsForService(serviceId: string) {
+  return Object.values(FIELD_REGISTRY).filter((field) => field.usedBy.includes(serviceId));
+}
+"""
+
+WIZARD = """\
+export const WIZARD_STEPS: WizardStep[] = [
+  {
+    id: 'systems-step',
+    moduleId: 'systems',
+    fields: [
+      {
+        name: 'detailedSystems',
+        component: SystemsList,
+      },
+    ],
+  },
+];
+"""
+
+
+def test_index_field_registry():
+    fields, id_mismatches, source_paths, used_by = audit_script.index_field_registry(REGISTRY.splitlines())
+
+    assert fields == {'crm_system': [4, 21], 'company_size': [16]}
+    assert id_mismatches == [('company_size', 'company-size', 17)]
+    assert source_paths == {'modules.systems.detailedSystems.specificSystem': {'crm_system'}}
+    assert used_by == {'crm_system': ['auto-crm-update', 'int-simple'], 'company_size': ['*']}
+
+
+def test_index_wizard_fields():
+    wizard_fields = audit_script.index_wizard_fields(WIZARD.splitlines())
+    assert wizard_fields == {'modules.systems.detailedSystems': [7]}
+
+
+def test_is_collected_by_wizard_matches_parent_paths():
+    wizard_fields = {'modules.systems.detailedSystems': [7]}
+    assert audit_script.is_collected_by_wizard('modules.systems.detailedSystems.specificSystem', wizard_fields)
+    assert audit_script.is_collected_by_wizard('modules.systems.detailedSystems', wizard_fields)
+    assert not audit_script.is_collected_by_wizard('modules.systems', wizard_fields)
+    assert not audit_script.is_collected_by_wizard('modules.systems.detailedSystemsCount', wizard_fields)
+
+
+def test_check_fields_treats_used_by_as_used():
+    registry = audit_script.index_field_registry(REGISTRY.splitlines())
+    sources = {
+        'registry': registry,
+        'wizard_fields': audit_script.index_wizard_fields(WIZARD.splitlines()),
+        'field_refs': {},
+        'component_map': {'auto-crm-update': 'CrmUpdateSpec'},
+    }
+    messages = [finding.message for finding in audit_script.check_fields(sources)]
+
+    assert not any(message.startswith('Unused field') for message in messages)
+    assert "Registry field 'crm_system' is used by unknown service 'int-simple'" in messages
+    assert not any("'*'" in message for message in messages)
+    assert "Duplicate registry field 'crm_system' at lines [4, 21]" in messages
+
+
+def test_read_roots_file_keeps_hash_in_paths(tmp_path):
+    roots_file = tmp_path / "forks.txt"
+    roots_file.write_text("# client forks\nfork-a\n\n  # disabled\nclient#2\n/abs/fork-b\n", encoding='utf-8')
+
+    assert audit_script.read_roots_file(roots_file) == [
+        tmp_path / "fork-a",
+        tmp_path / "client#2",
+        Path("/abs/fork-b"),
+    ]
+
+
+def write_checkout(root, with_wizard=True):
+    config_dir = root / "src" / "config"
+    component_dir = root / "src" / "components" / "Phase2" / "ServiceRequirements" / "Automations"
+    config_dir.mkdir(parents=True)
+    component_dir.mkdir(parents=True)
+    (config_dir / "serviceComponentMapping.ts").write_text(
+        "export const SERVICE_COMPONENT_MAP: Record<string, React.FC> = {\n"
+        "  'auto-crm-update': AutoCRMUpdateSpec,\n"
+        "};\n", encoding='utf-8')
+    (config_dir / "fieldRegistry.ts").write_text(REGISTRY, encoding='utf-8')
+    if with_wizard:
+        (config_dir / "wizardSteps.ts").write_text(WIZARD, encoding='utf-8')
+    (component_dir / "AutoCRMUpdateSpec.tsx").write_text("fieldId: 'crm_system',\n", encoding='utf-8')
+
+
+def test_extract_roots_shares_identical_files_and_reports_missing(tmp_path):
+    roots = [tmp_path / "fork-a", tmp_path / "fork-b"]
+    write_checkout(roots[0])
+    write_checkout(roots[1], with_wizard=False)
+
+    for jobs in (1, 2):
+        stats = {}
+        sources = dict(audit_script.extract_roots(roots, jobs, stats))
+
+        assert stats == {'files': 7, 'unique_files': 4}
+        assert sources[roots[0]]['missing'] == []
+        assert sources[roots[1]]['missing'] == ['src/config/wizardSteps.ts']
+        assert sources[roots[0]]['registry'] is sources[roots[1]]['registry']
+        assert sources[roots[1]]['component_files'] == {
+            'AutoCRMUpdateSpec': {
+                'path': 'src/components/Phase2/ServiceRequirements/Automations/AutoCRMUpdateSpec.tsx',
+                'category_dir': 'Automations',
+                'exists': True,
+            },
+        }
+        assert sources[roots[1]]['field_refs'] == {
+            'crm_system': {'src/components/Phase2/ServiceRequirements/Automations/AutoCRMUpdateSpec.tsx'},
+        }
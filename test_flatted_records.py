@@ -0,0 +1,160 @@
+"""
+Behavior tests for flatted_records.py against the vendored flatted.py
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+import flatted_records
+
+sys.path.insert(0, str(Path(__file__).parent / "node_modules" / "flatted" / "python"))
+import flatted  # noqa: E402
+
+
+def stringify(value):
+    """Identity-based flatted encoder (flatted.stringify dedupes by equality)"""
+    entries = []
+    known = {}
+
+    def index(item):
+        key = ('s', item) if isinstance(item, str) else id(item)
+        if key not in known:
+            known[key] = str(len(entries))
+            entries.append(item)
+        return known[key]
+
+    def relate(item):
+        return index(item) if isinstance(item, (str, list, dict)) else item
+
+    index(value)
+    i = 0
+    while i < len(entries):
+        entry = entries[i]
+        if isinstance(entry, list):
+            entries[i] = [relate(item) for item in entry]
+        elif isinstance(entry, dict):
+            entries[i] = {key: relate(item) for key, item in entry.items()}
+        i += 1
+    return json.dumps(entries)
+
+
+def same_graph(a, b, seen=None):
+    """Structural equality that also requires the same sharing and cycles"""
+    seen = {} if seen is None else seen
+    if isinstance(a, (dict, list, flatted_records.Record)):
+        if id(a) in seen:
+            return seen[id(a)] is b
+        seen[id(a)] = b
+        if isinstance(a, list):
+            return isinstance(b, list) and len(a) == len(b) and all(
+                same_graph(x, y, seen) for x, y in zip(a, b))
+        return set(a.keys()) == set(b.keys()) and all(same_graph(a[k], b[k], seen) for k in a.keys())
+    return a == b and type(a) is type(b)
+
+
+def sample_meeting():
+    shared = {'trigger': 'webhook', 'retries': 3}
+    meeting = {
+        'meetingId': 'm1', 'id': 'm1', 'clientName': 'לקוח', 'date': '2025-10-10',
+        'modules': {'overview': {'businessType': 'b2b', 'employees': None}},
+        'painPoints': [], 'phase': 'discovery', 'status': 'active',
+        'phaseHistory': [{'fromPhase': 'discovery', 'toPhase': 'implementation_spec', 'timestamp': 't'}],
+        'totalROI': 1.5,
+        'implementationSpec': {
+            'systems': [], 'integrations': [], 'aiAgents': [], 'acceptanceCriteria': {},
+            'automations': [
+                {'serviceId': 'auto-crm-update', 'status': 'configuring', 'requirements': shared},
+                {'serviceId': 'auto-reports', 'requirements': shared, 'notes': 'optional field'},
+            ],
+            'totalEstimatedHours': 10, 'completionPercentage': 0, 'lastUpdated': 'x', 'updatedBy': 'me',
+        },
+    }
+    meeting['modules']['overview']['meeting'] = meeting
+    return meeting
+
+
+def test_parse_matches_flatted_without_schema():
+    text = stringify(sample_meeting())
+    assert same_graph(flatted_records.parse(text), flatted.parse(text))
+
+
+def test_parse_primitives_match_flatted():
+    for value in ['text', 42, 1.5, True, None, [], {}, [1, 'a', None]]:
+        text = flatted.stringify(value)
+        assert flatted_records.parse(text) == flatted.parse(text)
+
+
+def test_records_round_trip_to_flatted_structure():
+    text = stringify(sample_meeting())
+    meeting = flatted_records.parse(text, record_schema=flatted_records.MEETING_RECORD_SCHEMA)
+
+    assert type(meeting).__name__ == 'Meeting'
+    assert meeting['modules']['overview']['meeting'] is meeting
+    automations = meeting.implementationSpec.automations
+    assert automations[0].requirements is automations[1].requirements
+    assert 'notes' not in automations[0] and automations[1]['notes'] == 'optional field'
+    plain = flatted_records.to_builtin(meeting)
+    assert same_graph(plain, flatted.parse(text))
+    assert same_graph(flatted_records.parse(stringify(plain)), flatted.parse(text))
+
+
+def test_records_compare_equal_to_dicts():
+    schema = {'Phase': ['fromPhase', 'toPhase', 'timestamp?']}
+    text = stringify([{'fromPhase': 'a', 'toPhase': 'b'}, {'fromPhase': 'a', 'toPhase': 'b'}])
+    first, second = flatted_records.parse(text, record_schema=schema)
+    assert first == second == {'fromPhase': 'a', 'toPhase': 'b'}
+    assert first != {'fromPhase': 'a'}
+
+
+def test_auto_records_skip_keys_that_cannot_be_slots():
+    rows = [{'items': i, 'name': f"n{i}"} for i in range(20)]
+    rows += [{'value': i, 'label': f"l{i}"} for i in range(20)]
+    parsed = flatted_records.parse(stringify(rows), auto_records=True)
+    assert isinstance(parsed[0], dict)
+    assert isinstance(parsed[-1], flatted_records.AutoRecord)
+    assert parsed == rows
+
+
+def test_auto_records_skip_dunder_keys():
+    for key in ['__v', '__dict__', '__weakref__']:
+        rows = [{'_id': f"id{i}", key: i} for i in range(10)]
+        parsed = flatted_records.parse(stringify(rows), auto_records=True)
+        assert isinstance(parsed[0], dict)
+        assert parsed == rows
+
+
+def test_schema_rejects_dunder_fields():
+    with pytest.raises(ValueError):
+        flatted_records.parse(stringify({'__v': 0}), record_schema={'Versioned': ['__v']})
+
+
+def test_keys_are_shared_across_archives():
+    first = flatted_records.parse(stringify({'someUnusualKeyName': 1}))
+    second = flatted_records.parse(stringify({'someUnusualKeyName': 2}))
+    assert next(iter(first)) is next(iter(second))
+
+
+def test_records_reach_memory_target():
+    # Like real backups, service entries mostly hold enum-like strings, flags
+    # and small numbers; timestamps and IDs are unique per meeting
+    archives = []
+    for archive in range(3):
+        meetings = []
+        for i in range(200):
+            meeting = sample_meeting()
+            meeting['meetingId'] = meeting['id'] = f"m{archive}-{i}"
+            updated_at = f"2025-10-10T10:{i // 60:02d}:{i % 60:02d}Z"
+            meeting['implementationSpec']['automations'] = [
+                {'serviceId': f"auto-{j}", 'serviceName': 'Auto', 'status': 'not_started',
+                 'requirements': {'trigger': 'webhook', 'enabled': j % 2 == 0, 'retryAttempts': 3},
+                 'updatedAt': updated_at}
+                for j in range(20)
+            ]
+            meetings.append(meeting)
+        archives.append(stringify(meetings))
+
+    _, _, ratio = flatted_records.memory_ratio(archives)
+    assert ratio >= flatted_records.TARGET_MEMORY_RATIO